@@ -1,11 +1,15 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import datetime
 import time
 import os
 import sys
 import html
-from bs4 import BeautifulSoup
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from selectolax.lexbor import LexborHTMLParser
 
 try:
     if sys.stdout.encoding != 'utf-8':
@@ -17,11 +21,34 @@ API_BASE_URL = "https://www.slobodenpecat.mk/wp-json/wp/v2/posts"
 DATA_DIR = "data"
 MAX_PAGES_PER_CATEGORY = 20
 DELAY = 0.2
+MAX_WORKERS = 6
+REQUEST_TIMEOUT = (5, 30)
+
+# First line of each data/{category}.urls index: the category file size and
+# article count it was written for. Fixed width so it can be updated in place.
+URLS_HEADER = "#json_size={:020d} articles={:012d}\n"
+URLS_HEADER_RE = re.compile(r'#json_size=(\d{20}) articles=(\d{12})$')
+
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+))
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'
+})
 
 def get_category_file(category_name):
     os.makedirs(DATA_DIR, exist_ok=True)
     return os.path.join(DATA_DIR, f"{category_name}.json")
 
+def get_urls_file(category_file):
+    return os.path.splitext(category_file)[0] + ".urls"
+
+def get_file_size(filepath):
+    return os.path.getsize(filepath) if os.path.exists(filepath) else 0
+
 CATEGORY_IDS = {
     "makedonija": 57,
     "skopje": 1089,
@@ -52,20 +79,27 @@ CATEGORY_IDS = {
     "ostanato-sport": 86
 }
 
+UNWANTED_SELECTOR = '.related-posts, .sharedaddy, .jp-relatedposts, script, style, iframe, figure, form'
+PROMO_RE = re.compile('Прочитајте|Read More|Ви препорачуваме')
+TEXT_BLOCK_RE = re.compile(r'<(?:p|h2|h3|ul|ol)\b', re.IGNORECASE)
+
 def clean_html_content(html_content):
-    if not html_content:
+    # Only p/h2/h3/ul/ol text is kept, so without such a tag there is nothing to parse
+    if not html_content or not TEXT_BLOCK_RE.search(html_content):
         return ""
     
-    soup = BeautifulSoup(html_content, 'html.parser')
+    tree = LexborHTMLParser(html_content)
     
-    for unwanted in soup.select('.related-posts, .sharedaddy, .jp-relatedposts, script, style, iframe, figure, form'):
+    # Matches come in document order; walking them backwards removes nested
+    # matches before their ancestors, so no node is touched after it is freed
+    for unwanted in reversed(tree.css(UNWANTED_SELECTOR)):
         unwanted.decompose()
         
     text_parts = []
     
-    for p in soup.find_all(['p', 'h2', 'h3', 'ul', 'ol']):
-        t = p.get_text(strip=True)
-        if len(t) < 100 and ("Прочитајте" in t or "Read More" in t or "Ви препорачуваме" in t):
+    for p in tree.css('p, h2, h3, ul, ol'):
+        t = p.text(strip=True)
+        if len(t) < 100 and PROMO_RE.search(t):
             continue
         if t:
             text_parts.append(t)
@@ -75,9 +109,8 @@ def clean_html_content(html_content):
 def fetch_category_posts(category_name, category_id, category_file):
     print(f"\n--- Scraping Category: {category_name} (ID: {category_id}) ---")
     
-    existing_data = load_data(category_file)
-    existing_urls = {item['url'] for item in existing_data}
-    print(f"Loaded {len(existing_data)} existing articles for {category_name}")
+    existing_urls, existing_count = load_existing_urls(category_file)
+    print(f"Loaded {existing_count} existing articles for {category_name}")
     
     new_articles = []
     
@@ -89,10 +122,7 @@ def fetch_category_posts(category_name, category_id, category_file):
         }
         
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'
-            }
-            r = requests.get(API_BASE_URL, params=params, headers=headers)
+            r = SESSION.get(API_BASE_URL, params=params, timeout=REQUEST_TIMEOUT)
             
             if r.status_code == 400: 
                 print(f"[{category_name}] Reached end of pagination at page {page}.")
@@ -106,6 +136,8 @@ def fetch_category_posts(category_name, category_id, category_file):
                 break
                 
             page_new = 0
+            page_log = []
+            now_iso = datetime.datetime.now().isoformat()
             for post in posts:
                 link = post.get('link')
                 if link in existing_urls:
@@ -121,15 +153,19 @@ def fetch_category_posts(category_name, category_id, category_file):
                     'text': text,
                     'categories': [category_name],
                     'page_id': post.get('id'),
-                    'scraped_at': datetime.datetime.now().isoformat()
+                    'scraped_at': now_iso
                 }
                 
                 new_articles.append(article)
                 existing_urls.add(link)
                 page_new += 1
-                
+                page_log.append(f"[{category_name}] Scraped: {title[:50]}...\n")
+            
+            # One write per page instead of one print per article keeps
+            # workers from contending for the stdout lock
+            if page_log:
                 try:
-                    print(f"[{category_name}] Scraped: {title[:50]}...")
+                    sys.stdout.write("".join(page_log))
                 except:
                     pass
                     
@@ -144,23 +180,40 @@ def fetch_category_posts(category_name, category_id, category_file):
             print(f"[{category_name}] Error on page {page}: {e}")
             break
     
-    existing_data.extend(new_articles)
-    return existing_data, len(new_articles)
+    return new_articles, existing_count
+
+def abort_if_lfs_pointer(content, filepath):
+    # SAFETY CHECK: Detect Git LFS pointer files
+    if content.startswith(b'version https://git-lfs.github.com/spec/v1'):
+        print(f"CRITICAL ERROR: File {filepath} is a Git LFS pointer, not actual data!")
+        print("This means Git LFS files were not downloaded correctly.")
+        sys.exit(1) # Abort immediately to prevent data loss
+
+def check_category_file(filepath):
+    if not os.path.exists(filepath):
+        return
+    
+    with open(filepath, 'rb') as f:
+        head = f.read(64)
+        f.seek(max(0, os.path.getsize(filepath) - 64))
+        tail = f.read()
+    
+    abort_if_lfs_pointer(head, filepath)
+    
+    if not head.lstrip().startswith(b'[') or not tail.rstrip().endswith(b']'):
+        print(f"Error: {filepath} is not a JSON array. File might be corrupted.")
+        sys.exit(1)
 
 def load_data(filepath):
     if os.path.exists(filepath):
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
+            with open(filepath, 'rb') as f:
                 content = f.read()
                 
-            # SAFETY CHECK: Detect Git LFS pointer files
-            if content.startswith('version https://git-lfs.github.com/spec/v1'):
-                print(f"CRITICAL ERROR: File {filepath} is a Git LFS pointer, not actual data!")
-                print("This means Git LFS files were not downloaded correctly.")
-                sys.exit(1) # Abort immediately to prevent data loss
+            abort_if_lfs_pointer(content, filepath)
                 
-            return json.loads(content)
-        except json.JSONDecodeError:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
             print(f"Error: Failed to parse JSON from {filepath}. File might be corrupted.")
             # If file exists but is invalid JSON, do NOT return empty list
             # causing overwrite. Better to fail and preserve the file.
@@ -170,9 +223,89 @@ def load_data(filepath):
             sys.exit(1)
     return []
 
+# Returns (known URLs, article count) for a category from its .urls index
+def load_existing_urls(category_file):
+    urls_file = get_urls_file(category_file)
+    
+    if os.path.exists(urls_file):
+        with open(urls_file, 'r', encoding='utf-8') as f:
+            header = URLS_HEADER_RE.match(f.readline())
+            urls = f.read().splitlines()
+        
+        # Only trust an index written for the category file as it is now
+        if header and int(header.group(1)) == get_file_size(category_file):
+            return set(urls), int(header.group(2))
+    
+    # No index, or a stale one: rebuild it from the category file itself.
+    # A new category gets an empty file so every index has its data/*.json.
+    if not os.path.exists(category_file):
+        save_data([], category_file)
+    
+    data = load_data(category_file)
+    urls = [item['url'] for item in data if item.get('url')]
+    with open(urls_file, 'w', encoding='utf-8') as f:
+        f.write(URLS_HEADER.format(get_file_size(category_file), len(data)))
+        f.writelines(f"{url}\n" for url in urls)
+    return set(urls), len(data)
+
+def append_urls(urls, urls_file, category_file, article_count):
+    with open(urls_file, 'a', encoding='utf-8') as f:
+        f.writelines(f"{url}\n" for url in urls if url)
+    
+    # The header is fixed-width, so it can be rewritten in place
+    with open(urls_file, 'r+b') as f:
+        f.write(URLS_HEADER.format(get_file_size(category_file), article_count).encode('ascii'))
+
 def save_data(data, filepath):
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    with open(filepath, 'wb') as f:
+        f.write(orjson.dumps(data))
+
+# Adds articles to the end of the existing JSON array without rewriting it
+def append_data(new_articles, filepath):
+    if not new_articles:
+        return
+    
+    if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
+        save_data(new_articles, filepath)
+        return
+    
+    payload = b','.join(orjson.dumps(article) for article in new_articles)
+    
+    with open(filepath, 'r+b') as f:
+        # Locate the closing bracket of the existing array, skipping trailing whitespace
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        start = max(0, size - 4096)
+        f.seek(start)
+        tail = f.read().rstrip()
+        
+        if not tail.endswith(b']'):
+            # Never write into something that is not a JSON array (e.g. a Git LFS pointer)
+            print(f"CRITICAL ERROR: File {filepath} does not end with a JSON array. Refusing to append.")
+            sys.exit(1)
+        
+        is_empty = tail[:-1].rstrip().endswith(b'[')
+        
+        f.seek(start + len(tail) - 1)
+        f.write((b'' if is_empty else b',') + payload + b']')
+        f.truncate()
+
+def scrape_category(cat_name, cat_id):
+    category_file = get_category_file(cat_name)
+    new_articles, existing_count = fetch_category_posts(cat_name, cat_id, category_file)
+    
+    total_count = existing_count + len(new_articles)
+    
+    # Each category has its own file, so workers never write to the same path.
+    # Articles go first: if the run dies in between, the index header no longer
+    # matches the file size and the next run rebuilds it from the articles.
+    if new_articles:
+        append_data(new_articles, category_file)
+        append_urls([article['url'] for article in new_articles],
+                    get_urls_file(category_file), category_file, total_count)
+    print(f"[{cat_name}] Saved to {category_file}")
+    
+    return len(new_articles), total_count
 
 def main():
     print(f"Starting API scrape with category-based file storage.")
@@ -180,19 +313,33 @@ def main():
     
     os.makedirs(DATA_DIR, exist_ok=True)
     
+    # Validate every file up front: sys.exit() inside a worker would only
+    # end that worker while the others keep scraping and writing
+    for cat_name in CATEGORY_IDS:
+        check_category_file(get_category_file(cat_name))
+    
     total_added = 0
     total_articles = 0
     
-    for cat_name, cat_id in CATEGORY_IDS.items():
-        category_file = get_category_file(cat_name)
-        category_data, new_count = fetch_category_posts(cat_name, cat_id, category_file)
-        
-        save_data(category_data, category_file)
-        
-        total_added += new_count
-        total_articles += len(category_data)
-        
-        print(f"[{cat_name}] Saved to {category_file}")
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(scrape_category, cat_name, cat_id)
+                for cat_name, cat_id in CATEGORY_IDS.items()
+            ]
+            
+            try:
+                for future in as_completed(futures):
+                    new_count, category_total = future.result()
+                    total_added += new_count
+                    total_articles += category_total
+            except BaseException:
+                # A failed category or Ctrl-C stops the queued categories
+                # instead of letting the executor scrape them all first
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+    finally:
+        SESSION.close()
             
     print(f"\n{'='*60}")
     print(f"Scraping finished!")
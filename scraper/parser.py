@@ -5,6 +5,12 @@ from datetime import datetime
 import html as html_lib
 from vezilka_schemas import Record, RecordMeta, RecordType
 
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,7 +71,7 @@ class Parser:
         if not html_content:
             return ""
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER)
         
         # Remove unwanted elements
         for unwanted in soup.select('.related-posts, .sharedaddy, .jp-relatedposts, script, style, iframe, figure, form'):
@@ -5,14 +5,23 @@ This is an optional utility to merge all category files back into one
 large JSON file if needed for backup, export, or other purposes.
 
 Usage:
-    python utils/consolidate_data.py [--output consolidated.json]
+    python utils/consolidate_data.py [--output consolidated.json] [--pretty]
 """
 
-import json
+import orjson
 import os
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+MAX_LOAD_WORKERS = 8
+
+
+def load_category_file(category_file):
+    """Load a single category file."""
+    with open(category_file, 'rb') as f:
+        return orjson.loads(f.read())
+
 
 def load_all_categories(data_dir):
     """Load all category files."""
@@ -20,58 +29,67 @@ def load_all_categories(data_dir):
         print(f"Error: Data directory '{data_dir}' not found!")
         return None
     
-    all_articles = []
-    seen_urls = set()
+    by_url = {}
+    add_article = by_url.setdefault
     category_counts = {}
     duplicate_count = 0
     
-    json_files = sorted([f for f in os.listdir(data_dir) if f.endswith('.json')])
+    with os.scandir(data_dir) as it:
+        json_files = sorted(
+            (entry for entry in it if entry.is_file() and entry.name.endswith('.json')),
+            key=lambda entry: entry.name
+        )
     
     print(f"Loading {len(json_files)} category files from '{data_dir}/'...")
     
-    for filename in json_files:
-        category_name = filename[:-5]  # Remove .json extension
-        filepath = os.path.join(data_dir, filename)
+    # Files are parsed in parallel but merged in name order, so the
+    # first-occurrence-wins deduplication stays deterministic
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_LOAD_WORKERS, len(json_files)))) as executor:
+        futures = [executor.submit(load_category_file, entry.path) for entry in json_files]
         
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                articles = json.load(f)
-            
-            # Count articles before deduplication
-            original_count = len(articles)
-            new_count = 0
-            
-            # Add articles, removing duplicates by URL
-            for article in articles:
-                url = article.get('url')
-                if url and url not in seen_urls:
-                    all_articles.append(article)
-                    seen_urls.add(url)
-                    new_count += 1
-                elif url:
-                    duplicate_count += 1
+        for entry, future in zip(json_files, futures):
+            category_name = entry.name[:-5]  # Remove .json extension
             
-            category_counts[category_name] = {
-                'original': original_count,
-                'unique': new_count
-            }
-            
-            print(f"  ✓ {category_name}: {original_count} articles ({new_count} unique)")
-            
-        except Exception as e:
-            print(f"  ✗ Failed to load {filename}: {e}")
-    
+            try:
+                articles = future.result()
+                
+                # Count articles before deduplication
+                original_count = len(articles)
+                new_count = 0
+                
+                # Add articles, removing duplicates by URL (first occurrence wins)
+                for article in articles:
+                    url = article.get('url')
+                    if not url:
+                        continue
+                    if add_article(url, article) is article:
+                        new_count += 1
+                    else:
+                        duplicate_count += 1
+                
+                category_counts[category_name] = {
+                    'original': original_count,
+                    'unique': new_count
+                }
+                
+                print(f"  ✓ {category_name}: {original_count} articles ({new_count} unique)")
+                
+            except Exception as e:
+                print(f"  ✗ Failed to load {entry.name}: {e}")
+    
+    all_articles = list(by_url.values())
     return all_articles, category_counts, duplicate_count
 
 
-def save_consolidated_file(articles, output_file):
+def save_consolidated_file(articles, output_file, pretty=False):
     """Save consolidated articles to a single JSON file."""
     print(f"\nSaving {len(articles):,} articles to '{output_file}'...")
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(articles, f, ensure_ascii=False, indent=2)
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    with open(output_file, 'wb') as f:
+        written = f.write(orjson.dumps(articles, option=option))
     
-    file_size = os.path.getsize(output_file) / (1024*1024)  # MB
+    file_size = written / (1024*1024)  # MB
     print(f"✓ Saved successfully ({file_size:.2f} MB)")
 
 
@@ -111,6 +129,11 @@ def main():
         default='consolidated_data.json',
         help='Output file for consolidated data (default: consolidated_data.json)'
     )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Indent the output JSON for human reading'
+    )
     
     args = parser.parse_args()
     
@@ -131,7 +154,7 @@ def main():
         return 1
     
     # Save consolidated file
-    save_consolidated_file(all_articles, args.output)
+    save_consolidated_file(all_articles, args.output, args.pretty)
     
     # Print statistics
     print_statistics(category_counts, len(all_articles), duplicate_count)
@@ -11,18 +11,21 @@ Usage:
     python utils/query_data.py --search "keyword" --category sport --export results.json
 """
 
-import json
+import orjson
 import os
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from collections import defaultdict
 
+MAX_LOAD_WORKERS = 8
+
 
 def load_category_file(category_file):
     """Load a single category file."""
     try:
-        with open(category_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(category_file, 'rb') as f:
+            return orjson.loads(f.read())
     except Exception as e:
         print(f"Warning: Failed to load {category_file}: {e}")
         return []
@@ -35,16 +38,18 @@ def load_all_categories(data_dir):
         return {}
     
     category_data = {}
-    json_files = [f for f in os.listdir(data_dir) if f.endswith('.json')]
+    with os.scandir(data_dir) as it:
+        json_files = [entry for entry in it if entry.is_file() and entry.name.endswith('.json')]
     
     print(f"Loading {len(json_files)} category files from '{data_dir}/'...")
     
-    for filename in json_files:
-        category_name = filename[:-5]  # Remove .json extension
-        filepath = os.path.join(data_dir, filename)
-        articles = load_category_file(filepath)
-        category_data[category_name] = articles
-        print(f"  ✓ {category_name}: {len(articles):,} articles")
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_LOAD_WORKERS, len(json_files)))) as executor:
+        loaded = executor.map(load_category_file, (entry.path for entry in json_files))
+        
+        for entry, articles in zip(json_files, loaded):
+            category_name = entry.name[:-5]  # Remove .json extension
+            category_data[category_name] = articles
+            print(f"  ✓ {category_name}: {len(articles):,} articles")
     
     return category_data
 
@@ -77,17 +82,19 @@ def filter_by_date_range(category_data, start_date=None, end_date=None):
     """Filter articles by date range."""
     results = []
     
+    # scraped_at is a naive ISO-8601 timestamp, so string order matches time order
+    start_s = start_date.isoformat() if start_date else None
+    end_s = end_date.isoformat() if end_date else None
+    
     for category, articles in category_data.items():
         for article in articles:
             scraped_at = article.get('scraped_at', '')
             if not scraped_at:
                 continue
             
-            article_date = datetime.fromisoformat(scraped_at)
-            
-            if start_date and article_date < start_date:
+            if start_s and scraped_at < start_s:
                 continue
-            if end_date and article_date > end_date:
+            if end_s and scraped_at > end_s:
                 continue
             
             results.append({
@@ -107,26 +114,33 @@ def get_statistics(category_data):
         'date_range': {'earliest': None, 'latest': None}
     }
     
-    all_dates = []
+    earliest = None
+    latest = None
     
     for category, articles in category_data.items():
         count = len(articles)
         stats['total_articles'] += count
         stats['categories'][category] = count
         
-        # Collect dates
-        for article in articles:
-            scraped_at = article.get('scraped_at')
-            if scraped_at:
-                try:
-                    date = datetime.fromisoformat(scraped_at)
-                    all_dates.append(date)
-                except:
-                    pass
+        # ISO-8601 strings sort chronologically, so compare them without parsing
+        dates = [article['scraped_at'] for article in articles if article.get('scraped_at')]
+        if dates:
+            category_earliest = min(dates)
+            category_latest = max(dates)
+            if earliest is None or category_earliest < earliest:
+                earliest = category_earliest
+            if latest is None or category_latest > latest:
+                latest = category_latest
     
-    if all_dates:
-        stats['date_range']['earliest'] = min(all_dates).isoformat()
-        stats['date_range']['latest'] = max(all_dates).isoformat()
+    # Only the two extremes are parsed, to normalize them for display
+    if earliest:
+        try:
+            earliest = datetime.fromisoformat(earliest).isoformat()
+            latest = datetime.fromisoformat(latest).isoformat()
+            stats['date_range']['earliest'] = earliest
+            stats['date_range']['latest'] = latest
+        except ValueError:
+            pass
     
     return stats
 
@@ -184,8 +198,8 @@ def export_results(results, output_file):
     """Export search results to a JSON file."""
     articles_only = [r['article'] for r in results]
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(articles_only, f, ensure_ascii=False, indent=2)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(articles_only, option=orjson.OPT_INDENT_2))
     
     print(f"\n✓ Exported {len(results)} articles to '{output_file}'")
 
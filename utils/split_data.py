@@ -5,10 +5,10 @@ This is a one-time migration script to reorganize data from a single
 large JSON file into smaller, category-specific files.
 
 Usage:
-    python utils/split_data.py [--input path] [--output-dir path]
+    python utils/split_data.py [--input path] [--output-dir path] [--pretty]
 """
 
-import json
+import orjson
 import os
 import shutil
 import argparse
@@ -37,11 +37,11 @@ def load_articles(input_file):
     print(f"File size: {os.path.getsize(input_file) / (1024*1024):.2f} MB")
     
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            articles = json.load(f)
+        with open(input_file, 'rb') as f:
+            articles = orjson.loads(f.read())
         print(f"✓ Loaded {len(articles):,} articles")
         return articles
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"Error: Failed to parse JSON file - {e}")
         return None
     except Exception as e:
@@ -70,21 +70,27 @@ def group_by_category(articles):
     return category_groups
 
 
-def save_category_files(category_groups, output_dir):
+def save_category_files(category_groups, output_dir, pretty=False):
     """Save each category to its own JSON file."""
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     print(f"\nSaving category files to '{output_dir}/'...")
     
     stats = {}
+    option = orjson.OPT_INDENT_2 if pretty else 0
     
     for category, articles in category_groups.items():
         output_file = os.path.join(output_dir, f"{category}.json")
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, ensure_ascii=False, indent=2)
+        # scrape.py's URL index describes the old file; drop it so it gets rebuilt
+        urls_file = os.path.join(output_dir, f"{category}.urls")
+        if os.path.exists(urls_file):
+            os.remove(urls_file)
         
-        file_size = os.path.getsize(output_file) / (1024*1024)  # MB
+        with open(output_file, 'wb') as f:
+            written = f.write(orjson.dumps(articles, option=option))
+        
+        file_size = written / (1024*1024)  # MB
         stats[category] = {
             'count': len(articles),
             'size_mb': file_size
@@ -145,6 +151,11 @@ def main():
         action='store_true',
         help='Skip creating backup of original file'
     )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Indent the output JSON for human reading'
+    )
     
     args = parser.parse_args()
     
@@ -168,7 +179,7 @@ def main():
     category_groups = group_by_category(articles)
     
     # Save category files
-    stats = save_category_files(category_groups, args.output_dir)
+    stats = save_category_files(category_groups, args.output_dir, args.pretty)
     
     # Print statistics
     print_statistics(original_count, stats)